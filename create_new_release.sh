@@ -1,14 +1,54 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
+# Usage: ./create_new_release.sh [-y|--yes]
+#   -y, --yes  Skip the confirmation prompt (required when stdin is not a terminal)
+ASSUME_YES=false
+for ARG in "$@"; do
+    case "${ARG}" in
+        -y|--yes)
+            ASSUME_YES=true
+            ;;
+        *)
+            echo "❌ Error: Unknown argument: ${ARG}"
+            echo "Usage: $0 [-y|--yes]"
+            exit 1
+            ;;
+    esac
+done
+
+# Without a terminal the confirmation prompt can't be answered, so fail before changing anything
+if [ "${ASSUME_YES}" != true ] && [ ! -t 0 ]; then
+    echo "❌ Error: stdin is not a terminal. Pass --yes to release without confirmation."
+    exit 1
+fi
+
 echo "VSCode Array Inspector - Release Script"
 echo "============================================================"
 
-# Check current branch
-echo "Current branch: $(git rev-parse --abbrev-ref HEAD)"
+# Read current branch and repository root in a single git call
+{ read -r BRANCH; read -r REPO_ROOT; } < <(git rev-parse --abbrev-ref HEAD --show-toplevel)
+echo "Current branch: ${BRANCH}"
 
-# Check for uncommitted changes
-if [ -n "$(git status --porcelain)" ]; then
+# Releases are cut from main only (a detached HEAD reports "HEAD" here)
+if [ "${BRANCH}" != "main" ]; then
+    echo ""
+    echo "❌ Error: Releases must be created from the main branch."
+    exit 1
+fi
+
+# package.json and package-lock.json are addressed relative to the repository root
+cd "${REPO_ROOT}"
+
+# Check for uncommitted changes to tracked files (untracked files are never committed
+# or touched by the rollback, so they don't need to block a release)
+# git diff exits with 1 when there are differences and above 1 on errors
+DIFF_STATUS=0
+git diff --quiet HEAD -- || DIFF_STATUS=$?
+if [ "${DIFF_STATUS}" -gt 1 ]; then
+    exit "${DIFF_STATUS}"
+fi
+if [ "${DIFF_STATUS}" -eq 1 ]; then
     echo ""
     echo "❌ Error: You have uncommitted changes."
     echo "Please commit or stash them before running the release script."
@@ -18,20 +58,30 @@ fi
 # Bump version
 echo ""
 echo "=== Bumping minor version ==="
-npm version minor -m "Release version %s"
-
-# npm version creates a tag with format vX.Y.Z, but we need release/vX.Y.Z
-NEW_VERSION=$(node -p "require('./package.json').version")
-NPM_TAG="v${NEW_VERSION}"
+# Edit the version fields directly instead of going through npm version,
+# which would also create a vX.Y.Z tag that we'd have to replace
+NEW_VERSION=$(node -e '
+const fs = require("fs");
+const pkg = JSON.parse(fs.readFileSync("package.json", "utf8"));
+const match = /^(\d+)\.(\d+)\.(\d+)$/.exec(pkg.version);
+if (!match) {
+    throw new Error(`Unexpected version in package.json: ${pkg.version}`);
+}
+const version = `${match[1]}.${Number(match[2]) + 1}.0`;
+pkg.version = version;
+fs.writeFileSync("package.json", JSON.stringify(pkg, null, 2) + "\n");
+const lock = JSON.parse(fs.readFileSync("package-lock.json", "utf8"));
+lock.version = version;
+lock.packages[""].version = version;
+fs.writeFileSync("package-lock.json", JSON.stringify(lock, null, 2) + "\n");
+console.log(version);
+')
 RELEASE_TAG="release/v${NEW_VERSION}"
 
-echo ""
-echo "✅ Version bumped to: ${NEW_VERSION}"
+git commit -m "Release version ${NEW_VERSION}" package.json package-lock.json
 
-# Remove npm-created tag and create release tag
 echo ""
-echo "Removing npm-created tag: ${NPM_TAG}"
-git tag -d "${NPM_TAG}"
+echo "✅ Version bumped to: ${NEW_VERSION}"
 
 echo "Creating release tag: ${RELEASE_TAG}"
 git tag "${RELEASE_TAG}"
@@ -49,16 +99,22 @@ echo "  1. Push the version bump commit to the remote repository"
 echo "  2. Push the release tag to trigger the deployment workflow"
 echo "  3. Automatically publish to VSCode Marketplace via GitHub Actions"
 echo ""
-read -r -p "Type 'yes' to confirm, anything else to cancel: " RESPONSE
+if [ "${ASSUME_YES}" = true ]; then
+    echo "Confirmation skipped (--yes)."
+    RESPONSE="yes"
+else
+    read -r -p "Type 'yes' to confirm, anything else to cancel: " RESPONSE
+fi
 
 if [ "${RESPONSE}" != "yes" ]; then
     echo ""
     echo "❌ Release cancelled."
     echo ""
     echo "Rolling back changes..."
-    git reset HEAD~1
+    # The working tree was clean before the bump, so a hard reset drops the
+    # release commit and restores package.json and package-lock.json at once
+    git reset --hard HEAD~1
     git tag -d "${RELEASE_TAG}"
-    git restore package.json package-lock.json
     echo "✅ Changes rolled back."
     exit 1
 fi
@@ -66,8 +122,8 @@ fi
 # Push release
 echo ""
 echo "=== Pushing to remote ==="
-git push
-git push origin "${RELEASE_TAG}"
+# Push the branch and the tag together so either both refs update or neither does
+git push --atomic origin "HEAD:refs/heads/${BRANCH}" "refs/tags/${RELEASE_TAG}"
 
 echo ""
 echo "✅ Release tag pushed successfully!"